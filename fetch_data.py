@@ -11,13 +11,16 @@ physically span the season boundary (e.g. last 30 PA from 2025 + first
 new season alone, the pipeline switches to single-season mode.
 """
 
-import json
+import math
 import sys
 import os
+import time
 from datetime import datetime, date
 
 import pandas as pd
 import numpy as np
+import orjson
+from numba import njit, prange
 from pybaseball import (
     cache,
     statcast,
@@ -34,6 +37,14 @@ ROLLING_WINDOWS = [50, 100, 250]
 MIN_PA = 50
 TRANSITION_THRESHOLD = 10  # new-season players needed to exit transition
 
+# Pitch-level columns used downstream; everything else is dropped at fetch
+PITCH_COLUMNS = [
+    "batter", "events", "game_date", "at_bat_number",
+    "inning_topbot", "away_team", "home_team",
+    "woba_value", "woba_denom", "estimated_woba_using_speedangle",
+]
+PITCH_CACHE_TTL = 6 * 3600  # seconds before an in-progress season is refetched
+
 
 # ═══════════════════════════════════════════════════════════════════
 # SEASON MODE DETECTION
@@ -87,38 +98,101 @@ def get_season_dates(year):
     return start, end
 
 
+def _cached(path, fetch_fn, year, ttl=None):
+    """
+    Return the Parquet cache at ``path`` if it is still fresh, otherwise call
+    ``fetch_fn()`` and rewrite the cache.  A cache written after the season's
+    end date is final; otherwise it is reused while younger than ``ttl``
+    seconds, or for the rest of the day it was written when ``ttl`` is None.
+    """
+    _, end = get_season_dates(year)
+    if os.path.exists(path):
+        mtime = os.path.getmtime(path)
+        written = date.fromtimestamp(mtime)
+        if ttl is None:
+            fresh = written == date.today()
+        else:
+            fresh = time.time() - mtime < ttl
+        if fresh or written.strftime("%Y-%m-%d") > end:
+            print(f"  Loading cached {os.path.basename(path)}...")
+            return pd.read_parquet(path, engine="pyarrow")
+
+    df = fetch_fn()
+    try:
+        df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+    except Exception as e:
+        print(f"  [WARN] Could not cache {os.path.basename(path)}: {e}")
+    return df
+
+
 def fetch_expected_stats(year):
-    print(f"  Fetching expected statistics for {year}...")
-    df = statcast_batter_expected_stats(year, minPA=1)
+    def fetch():
+        print(f"  Fetching expected statistics for {year}...")
+        return statcast_batter_expected_stats(year, minPA=1)
+
+    df = _cached(os.path.join(OUTPUT_DIR, f"expected_{year}.parquet"), fetch, year)
     print(f"  -> {len(df)} batters retrieved")
     return df
 
 
 def fetch_ev_barrels(year):
-    print(f"  Fetching exit velocity & barrels for {year}...")
-    df = statcast_batter_exitvelo_barrels(year, minBBE=1)
+    def fetch():
+        print(f"  Fetching exit velocity & barrels for {year}...")
+        return statcast_batter_exitvelo_barrels(year, minBBE=1)
+
+    df = _cached(os.path.join(OUTPUT_DIR, f"ev_barrels_{year}.parquet"), fetch, year)
     print(f"  -> {len(df)} batters retrieved")
     return df
 
 
+def _compact_pitches(df):
+    """Project to PITCH_COLUMNS and downcast to the narrowest safe dtypes."""
+    df = df[PITCH_COLUMNS].copy()
+    for col in ["batter", "at_bat_number"]:
+        df[col] = df[col].astype(np.int32)
+    for col in ["woba_value", "woba_denom", "estimated_woba_using_speedangle"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype(np.float32)
+    for col in ["inning_topbot", "away_team", "home_team"]:
+        df[col] = df[col].astype("category")
+    return df
+
+
 def fetch_pitch_level(year):
-    start, end = get_season_dates(year)
-    print(f"  Fetching pitch-level data from {start} to {end}...")
-    print("  (this may take several minutes)")
-    df = statcast(start_dt=start, end_dt=end)
+    def fetch():
+        start, end = get_season_dates(year)
+        print(f"  Fetching pitch-level data from {start} to {end}...")
+        print("  (this may take several minutes)")
+        return _compact_pitches(statcast(start_dt=start, end_dt=end))
+
+    df = _cached(os.path.join(OUTPUT_DIR, f"pitches_{year}.parquet"), fetch, year,
+                 ttl=PITCH_CACHE_TTL)
+    df = _compact_pitches(df)
     print(f"  -> {len(df)} total pitches retrieved")
     return df
 
 
-def extract_batter_teams(pitch_df):
+def plate_appearances(pitch_df):
+    """Rows of pitch_df that ended a plate appearance (pitch_df itself if empty)."""
+    if len(pitch_df) == 0:
+        return pitch_df
+    return pitch_df[pitch_df["events"].notna()]
+
+
+def extract_batter_teams(pa_df):
     print("  Extracting batter team affiliations...")
-    pa_df = pitch_df[pitch_df["events"].notna()].copy()
-    pa_df["bat_team"] = pa_df.apply(
-        lambda r: r["away_team"] if r["inning_topbot"] == "Top" else r["home_team"],
-        axis=1,
+    pa_df = pa_df[["batter", "game_date", "inning_topbot", "away_team", "home_team"]]
+    pa_df = pa_df.assign(bat_team=np.where(
+        pa_df["inning_topbot"].to_numpy() == "Top",
+        pa_df["away_team"].to_numpy(),
+        pa_df["home_team"].to_numpy(),
+    ))
+    # Latest PA per batter: one dedup pass over the date-sorted frame
+    team_map = (
+        pa_df.sort_values("game_date")
+        .drop_duplicates("batter", keep="last")
+        .set_index("batter")["bat_team"]
+        .to_dict()
     )
-    pa_df = pa_df.sort_values("game_date")
-    team_map = pa_df.groupby("batter")["bat_team"].last().to_dict()
     print(f"  -> {len(team_map)} batter-team mappings extracted")
     return team_map
 
@@ -127,130 +201,260 @@ def extract_batter_teams(pitch_df):
 # ROLLING METRIC COMPUTATION (supports cross-season)
 # ═══════════════════════════════════════════════════════════════════
 
-def compute_rolling_metrics(pitch_df):
+def _format_dates(dates, fmt, str_slice):
+    """
+    Format a date column, falling back to string slicing for non-datetimes.
+    A season has a few hundred distinct dates, so each is formatted once and
+    broadcast back to the rows.
+    """
+    codes, uniques = pd.factorize(dates, use_na_sentinel=False)
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        labels = pd.Index(uniques).strftime(fmt)
+    else:
+        labels = pd.Index(uniques).astype(str).str[str_slice]
+    return np.asarray(labels, dtype=object)[codes]
+
+
+@njit(nogil=True, cache=True)
+def _widen(val):
+    """Widen a float32 Statcast value to float64 at Savant's 3-decimal precision."""
+    return np.rint(np.float64(val) * 1000.0) / 1000.0
+
+
+@njit(parallel=True, nogil=True, cache=True, error_model="numpy")
+def _rolling_triple(values, offsets, window, out_woba, out_xwoba, out_diff,
+                    out_trend_woba, out_trend_xwoba):
+    """
+    Trailing ``window``-PA sums of the (woba_value, woba_denom, xwoba_value)
+    columns of ``values`` for every batter in one pass, written out as
+    strict (full-window) wOBA/xwOBA/diff and warm-up trend wOBA/xwOBA.
+
+    ``values`` is float32; each value is widened with ``_widen`` so the
+    float64 accumulators see exactly the published decimals.  The running
+    sums use the same compensated add/remove arithmetic as pandas'
+    ``rolling(window, min_periods=1).sum()``, so the ratios match it bit for
+    bit and rounding stays identical.  Batters with fewer than ``window``
+    PAs are skipped and their rows left untouched.
+    """
+    n_cols = values.shape[1]
+    for b in prange(len(offsets) - 1):
+        start = offsets[b]
+        end = offsets[b + 1]
+        if end - start < window:
+            continue
+        total = np.zeros(n_cols)
+        comp_add = np.zeros(n_cols)
+        comp_remove = np.zeros(n_cols)
+        nobs = np.zeros(n_cols, dtype=np.int64)
+        same_run = np.zeros(n_cols, dtype=np.int64)
+        prev = np.empty(n_cols)
+        for k in range(n_cols):
+            prev[k] = _widen(values[start, k])
+        sums = np.empty(n_cols)
+
+        for i in range(start, end):
+            for k in range(n_cols):
+                if i - window >= start:
+                    val = _widen(values[i - window, k])
+                    if val == val:
+                        nobs[k] -= 1
+                        y = -val - comp_remove[k]
+                        t = total[k] + y
+                        comp_remove[k] = t - total[k] - y
+                        total[k] = t
+                val = _widen(values[i, k])
+                if val == val:
+                    nobs[k] += 1
+                    y = val - comp_add[k]
+                    t = total[k] + y
+                    comp_add[k] = t - total[k] - y
+                    total[k] = t
+                    # pandas returns value * nobs for a run of equal values
+                    # to avoid floating-point residue
+                    if val == prev[k]:
+                        same_run[k] += 1
+                    else:
+                        same_run[k] = 1
+                    prev[k] = val
+                if nobs[k] == 0:
+                    sums[k] = np.nan
+                elif same_run[k] >= nobs[k]:
+                    sums[k] = prev[k] * nobs[k]
+                else:
+                    sums[k] = total[k]
+
+            woba = sums[0] / sums[1]
+            xwoba = sums[2] / sums[1]
+            if i - start >= window - 1:
+                out_woba[i] = woba
+                out_xwoba[i] = xwoba
+                out_diff[i] = woba - xwoba
+            if sums[1] > 0:
+                out_trend_woba[i] = woba
+                out_trend_xwoba[i] = xwoba
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _fill_trends(rolling_woba, rolling_xwoba, offsets, out_woba, out_xwoba, out_idx, out_count):
+    """
+    Copy each batter's last ``out_woba.shape[1]`` non-NaN rolling values into
+    right-aligned rows of the output matrices, recording their source row
+    indices (for dates/seasons) and how many slots were filled.  Batters
+    with fewer PAs than the matrix width are skipped.
+    """
+    width = out_woba.shape[1]
+    for b in prange(len(offsets) - 1):
+        if offsets[b + 1] - offsets[b] < width:
+            continue
+        k = width
+        i = offsets[b + 1] - 1
+        while i >= offsets[b] and k > 0:
+            if not np.isnan(rolling_woba[i]):
+                k -= 1
+                out_woba[b, k] = rolling_woba[i]
+                out_xwoba[b, k] = rolling_xwoba[i]
+                out_idx[b, k] = i
+            i -= 1
+        out_count[b] = width - k
+
+
+def _to_float32(values):
+    return pd.to_numeric(values, errors="coerce").astype(np.float32)
+
+
+def compute_rolling_metrics(pa_df):
     """
     Compute rolling wOBA/xwOBA for every batter with MIN_PA+ plate appearances.
 
-    If pitch_df contains a ``data_season`` column (cross-season concatenated
+    ``pa_df`` holds one row per plate appearance (see plate_appearances).
+    If it contains a ``data_season`` column (cross-season concatenated
     data), the output includes per-window ``trend_seasons`` arrays and
     per-batter ``new_season_pa`` / ``cross_season`` flags.
     """
     print("  Computing rolling metrics...")
 
-    pa_df = pitch_df[pitch_df["events"].notna()].copy()
-    pa_df = pa_df.sort_values(["game_date", "at_bat_number"]).reset_index(drop=True)
+    pa_df = pa_df.astype({"batter": np.int32, "at_bat_number": np.int32})
+    # Batters below MIN_PA never produce output, so drop them before any
+    # sorting or rolling work.
+    pa_counts = pa_df["batter"].value_counts()
+    pa_df = pa_df[pa_df["batter"].isin(pa_counts.index[pa_counts >= MIN_PA])]
+    # Keep each batter's PAs contiguous and in chronological order so the
+    # per-batter offsets index straight into pa_df's rows.
+    pa_df = pa_df.sort_values(
+        ["batter", "game_date", "at_bat_number"], kind="stable"
+    ).reset_index(drop=True)
 
     has_season_col = "data_season" in pa_df.columns
 
-    pa_df["woba_value"] = pd.to_numeric(pa_df["woba_value"], errors="coerce").fillna(0)
-    pa_df["woba_denom"] = pd.to_numeric(pa_df["woba_denom"], errors="coerce").fillna(0)
-    pa_df["estimated_woba_using_speedangle"] = pd.to_numeric(
-        pa_df["estimated_woba_using_speedangle"], errors="coerce"
+    pa_df["woba_value"] = _to_float32(pa_df["woba_value"]).fillna(0)
+    pa_df["woba_denom"] = _to_float32(pa_df["woba_denom"]).fillna(0)
+    pa_df["estimated_woba_using_speedangle"] = _to_float32(
+        pa_df["estimated_woba_using_speedangle"]
     )
     pa_df["xwoba_value"] = pa_df["estimated_woba_using_speedangle"].fillna(
         pa_df["woba_value"]
     )
 
+    grouped = pa_df.groupby("batter", sort=False)
+    group_sizes = grouped.size()
+    batter_ids = group_sizes.index.to_numpy()
+    sizes = group_sizes.to_numpy()
+    ends = np.cumsum(sizes)
+    starts = ends - sizes
+    offsets = np.concatenate(([0], ends)).astype(np.int64)
+    n_batters = len(batter_ids)
+    pa_values = pa_df[["woba_value", "woba_denom", "xwoba_value"]].to_numpy(np.float32)
+
+    pa_dates = _format_dates(pa_df["game_date"], "%Y-%m-%d", slice(None, 10))
+    trend_date_labels = _format_dates(pa_df["game_date"], "%m/%d", slice(5, 10))
+    season_arr = pa_df["data_season"].to_numpy() if has_season_col else None
+
+    # One fused rolling pass per window across all batters.  The trend
+    # values use a partial trailing window so the chart can fill up to
+    # `window` bars even when total_pa is between `window` and `2*window-1`
+    # (standard warm-up for rolling visualizations).  Headline values are
+    # only set on rows with a full `window` PAs behind them, i.e. a true
+    # `window`-PA average.
+    window_data = {}
+    for window in ROLLING_WINDOWS:
+        strict_rolling_woba = np.full(len(pa_df), np.nan)
+        strict_rolling_xwoba = np.full(len(pa_df), np.nan)
+        strict_rolling_diff = np.full(len(pa_df), np.nan)
+        rolling_woba = np.full(len(pa_df), np.nan)
+        rolling_xwoba = np.full(len(pa_df), np.nan)
+        _rolling_triple(pa_values, offsets, window,
+                        strict_rolling_woba, strict_rolling_xwoba, strict_rolling_diff,
+                        rolling_woba, rolling_xwoba)
+
+        # Keep the last `window` valid rolling values per batter so the
+        # chart's data-point count matches its PA label (50 PA → 50 points)
+        trend_woba = np.full((n_batters, window), np.nan)
+        trend_xwoba = np.full((n_batters, window), np.nan)
+        trend_idx = np.zeros((n_batters, window), dtype=np.int64)
+        trend_count = np.zeros(n_batters, dtype=np.int64)
+        _fill_trends(rolling_woba, rolling_xwoba, offsets,
+                     trend_woba, trend_xwoba, trend_idx, trend_count)
+
+        window_data[window] = {
+            "woba": strict_rolling_woba,
+            "xwoba": strict_rolling_xwoba,
+            "diff": strict_rolling_diff,
+            "trend_woba": trend_woba,
+            "trend_xwoba": trend_xwoba,
+            "trend_idx": trend_idx,
+            "trend_count": trend_count,
+        }
+
     results = {}
-    grouped = pa_df.groupby("batter")
-    total_batters = len(grouped)
+    total_batters = len(batter_ids)
     processed = 0
 
-    for batter_id, batter_pa in grouped:
-        batter_pa = batter_pa.sort_values(["game_date", "at_bat_number"]).reset_index(drop=True)
-        total_pa = len(batter_pa)
-
-        if total_pa < MIN_PA:
+    for b, batter_id in enumerate(batter_ids):
+        total_pa = int(sizes[b])
+        windows = [w for w in ROLLING_WINDOWS if w <= total_pa]
+        if not windows:
             continue
 
-        # Record last PA date
-        last_date = batter_pa["game_date"].iloc[-1]
-        if hasattr(last_date, "strftime"):
-            batter_result_date = last_date.strftime("%Y-%m-%d")
-        else:
-            batter_result_date = str(last_date)[:10]
-
-        batter_result = {"total_pa": total_pa, "last_pa_date": batter_result_date, "windows": {}}
+        last = ends[b] - 1
+        batter_result = {"total_pa": total_pa, "last_pa_date": pa_dates[last], "windows": {}}
 
         # Season tracking
         if has_season_col:
-            season_arr = batter_pa["data_season"].values
-            unique_seasons = sorted(set(int(s) for s in season_arr))
+            batter_seasons = season_arr[starts[b]:ends[b]]
+            unique_seasons = np.unique(batter_seasons)
             if len(unique_seasons) > 1:
-                new_season = max(unique_seasons)
-                batter_result["new_season_pa"] = int((season_arr == new_season).sum())
+                new_season = unique_seasons[-1]
+                batter_result["new_season_pa"] = int((batter_seasons == new_season).sum())
                 batter_result["cross_season"] = True
             else:
                 batter_result["new_season_pa"] = total_pa
                 batter_result["cross_season"] = False
 
-        for window in ROLLING_WINDOWS:
-            if total_pa < window:
-                continue
-
-            # Headline rolling values use the strict window so the latest
-            # value is a true `window`-PA average.
-            strict_woba_num = batter_pa["woba_value"].rolling(window=window, min_periods=window).sum()
-            strict_woba_den = batter_pa["woba_denom"].rolling(window=window, min_periods=window).sum()
-            strict_xwoba_num = batter_pa["xwoba_value"].rolling(window=window, min_periods=window).sum()
-
-            strict_rolling_woba = strict_woba_num / strict_woba_den
-            strict_rolling_xwoba = strict_xwoba_num / strict_woba_den
-            strict_rolling_diff = strict_rolling_woba - strict_rolling_xwoba
-
-            latest_woba = strict_rolling_woba.iloc[-1] if not pd.isna(strict_rolling_woba.iloc[-1]) else None
-            latest_xwoba = strict_rolling_xwoba.iloc[-1] if not pd.isna(strict_rolling_xwoba.iloc[-1]) else None
-            latest_diff = strict_rolling_diff.iloc[-1] if not pd.isna(strict_rolling_diff.iloc[-1]) else None
-
-            # Trend uses min_periods=1 so the chart can fill up to `window`
-            # bars even when total_pa is between `window` and `2*window-1`
-            # (the leftmost bars use a partial trailing window — standard
-            # warm-up for rolling visualizations).
-            woba_num = batter_pa["woba_value"].rolling(window=window, min_periods=1).sum()
-            woba_den = batter_pa["woba_denom"].rolling(window=window, min_periods=1).sum()
-            xwoba_num = batter_pa["xwoba_value"].rolling(window=window, min_periods=1).sum()
-
-            rolling_woba = (woba_num / woba_den).where(woba_den > 0)
-            rolling_xwoba = (xwoba_num / woba_den).where(woba_den > 0)
-
-            valid_woba = rolling_woba.dropna()
-            valid_xwoba = rolling_xwoba.dropna()
-
-            # Keep the last `window` valid rolling values so the chart's
-            # data-point count matches its PA label (50 PA → 50 points, etc.)
-            if len(valid_woba) > window:
-                valid_woba = valid_woba.iloc[-window:]
-                valid_xwoba = valid_xwoba.iloc[-window:]
+        for window in windows:
+            wd = window_data[window]
+            latest_woba = float(wd["woba"][last])
+            latest_xwoba = float(wd["xwoba"][last])
+            latest_diff = float(wd["diff"][last])
 
             # Store all kept points at full resolution
-            if len(valid_woba) > 0:
-                trend_woba = [round(float(v), 3) for v in valid_woba.tolist()]
-                trend_xwoba = [round(float(v), 3) for v in valid_xwoba.tolist()]
-            else:
-                trend_woba = []
-                trend_xwoba = []
-
-            valid_idx = valid_woba.index.values if len(valid_woba) > 0 else []
-
-            # Collect game dates for each trend point
-            trend_dates = []
-            for pi in valid_idx:
-                d = batter_pa["game_date"].iloc[pi]
-                trend_dates.append(d.strftime("%m/%d") if hasattr(d, "strftime") else str(d)[5:10])
+            first = window - wd["trend_count"][b]
+            valid_idx = wd["trend_idx"][b, first:]
+            trend_woba = [round(v, 3) for v in wd["trend_woba"][b, first:].tolist()]
+            trend_xwoba = [round(v, 3) for v in wd["trend_xwoba"][b, first:].tolist()]
 
             win_result = {
-                "rolling_woba": round(float(latest_woba), 3) if latest_woba is not None else None,
-                "rolling_xwoba": round(float(latest_xwoba), 3) if latest_xwoba is not None else None,
-                "diff_rolling_OBA": round(float(latest_diff), 3) if latest_diff is not None else None,
+                "rolling_woba": None if math.isnan(latest_woba) else round(latest_woba, 3),
+                "rolling_xwoba": None if math.isnan(latest_xwoba) else round(latest_xwoba, 3),
+                "diff_rolling_OBA": None if math.isnan(latest_diff) else round(latest_diff, 3),
                 "trend_woba": trend_woba,
                 "trend_xwoba": trend_xwoba,
-                "trend_diff": [round(float(trend_woba[i] - trend_xwoba[i]), 3) for i in range(len(trend_woba))],
-                "trend_dates": trend_dates,
+                "trend_diff": np.round(np.subtract(trend_woba, trend_xwoba), 3).tolist(),
+                "trend_dates": trend_date_labels[valid_idx].tolist(),
             }
 
             # Cross-season: record which season each trend point belongs to
             if has_season_col and len(valid_idx) > 0:
-                win_result["trend_seasons"] = [int(season_arr[pi]) for pi in valid_idx]
+                win_result["trend_seasons"] = season_arr[valid_idx].astype(int).tolist()
 
             batter_result["windows"][str(window)] = win_result
 
@@ -271,18 +475,79 @@ def compute_rolling_metrics(pitch_df):
 
 NAME_COL = "last_name, first_name"
 
+# Output key -> source column, in output order
+SEASON_STAT_COLS = {
+    "batting_avg": "ba",
+    "wOBA": "woba",
+    "xwOBA": "est_woba",
+    "diff_season": "est_woba_minus_woba_diff",
+    "xBA": "est_ba",
+    "xSLG": "est_slg",
+}
+EV_STAT_COLS = {
+    "exit_velocity": "avg_hit_speed",
+    "launch_angle": "avg_hit_angle",
+    "hard_hit_pct": "ev95percent",
+    "barrel_pct": "brl_percent",
+    "max_exit_velocity": "max_hit_speed",
+}
+ROLLING_DIFF_PRIORITY = [100, 50, 250]
+
+
+def ev_frame(ev_df):
+    """One exit-velocity row per player_id, restricted to EV_STAT_COLS sources."""
+    if ev_df is None or len(ev_df) == 0:
+        return pd.DataFrame(columns=["player_id", *EV_STAT_COLS.values()])
+    ev_df = ev_df.drop_duplicates("player_id")
+    return ev_df.reindex(columns=["player_id", *EV_STAT_COLS.values()])
+
+
+def build_ev_lookup(ev_df):
+    """Index exit-velocity rows by player_id for O(1) per-player lookups."""
+    return ev_frame(ev_df).set_index("player_id").to_dict("index")
+
+
+def with_display_names(expected_df):
+    """Add a ``name`` column converting "Lastname, Firstname" to "Firstname Lastname"."""
+    if NAME_COL not in expected_df.columns:
+        return expected_df.assign(name="")
+    raw = expected_df[NAME_COL].fillna("").astype(str).str.strip()
+    names = raw.str.replace(r"^([^,]*?)\s*,\s*(.*)$", r"\2 \1", regex=True)
+    return expected_df.assign(name=names)
+
+
+def primary_rolling_diff(windows):
+    """First non-null diff_rolling_OBA in ROLLING_DIFF_PRIORITY order, else None."""
+    for w in ROLLING_DIFF_PRIORITY:
+        wd = windows.get(str(w))
+        if wd is not None and wd.get("diff_rolling_OBA") is not None:
+            return wd["diff_rolling_OBA"]
+    return None
+
+
+def index_rolling_data(rolling_data):
+    """
+    Per-field player_id lookups over rolling_data, built once per output:
+    output key -> {player_id: value}.  ``diff_rolling_OBA`` holds the
+    primary rolling diff and only covers players that have one.
+    """
+    index = {key: {} for key in ["rolling", "total_pa_events", "last_pa_date", "diff_rolling_OBA"]}
+    for pid, rd in rolling_data.items():
+        index["rolling"][pid] = rd["windows"]
+        index["total_pa_events"][pid] = rd["total_pa"]
+        if "last_pa_date" in rd:
+            index["last_pa_date"][pid] = rd["last_pa_date"]
+        diff = primary_rolling_diff(rd["windows"])
+        if diff is not None:
+            index["diff_rolling_OBA"][pid] = diff
+    return index
 
-def build_player(row, ev_df, rolling_data, team_map):
+
+def build_player(row, ev_lookup, rolling_index, team_map):
     """Build a single player dict from expected-stats row + auxiliary data."""
     player_id = int(row.get("player_id", 0))
     pa = int(row.get("pa", 0))
-
-    raw_name = str(row.get(NAME_COL, "")).strip()
-    if "," in raw_name:
-        parts = raw_name.split(",", 1)
-        name = f"{parts[1].strip()} {parts[0].strip()}"
-    else:
-        name = raw_name
+    name = row.get("name", "")
 
     team = team_map.get(player_id, "")
 
@@ -291,40 +556,26 @@ def build_player(row, ev_df, rolling_data, team_map):
         "name": name,
         "team": team,
         "pa": pa,
-        "batting_avg": safe_round(row.get("ba"), 3),
-        "wOBA": safe_round(row.get("woba"), 3),
-        "xwOBA": safe_round(row.get("est_woba"), 3),
-        "diff_season": safe_round(row.get("est_woba_minus_woba_diff"), 3),
-        "xBA": safe_round(row.get("est_ba"), 3),
-        "xSLG": safe_round(row.get("est_slg"), 3),
     }
-
-    if ev_df is not None:
-        ev_row = ev_df[ev_df["player_id"] == player_id]
-        if len(ev_row) > 0:
-            ev_row = ev_row.iloc[0]
-            player["exit_velocity"] = safe_round(ev_row.get("avg_hit_speed"), 1)
-            player["launch_angle"] = safe_round(ev_row.get("avg_hit_angle"), 1)
-            player["hard_hit_pct"] = safe_round(ev_row.get("ev95percent"), 1)
-            player["barrel_pct"] = safe_round(ev_row.get("brl_percent"), 1)
-            player["max_exit_velocity"] = safe_round(ev_row.get("max_hit_speed"), 1)
-
-    if player_id in rolling_data:
-        rd = rolling_data[player_id]
-        player["rolling"] = rd["windows"]
-        player["total_pa_events"] = rd["total_pa"]
-        if "last_pa_date" in rd:
-            player["last_pa_date"] = rd["last_pa_date"]
-
-        for w in [100, 50, 250]:
-            wkey = str(w)
-            if wkey in rd["windows"]:
-                wd = rd["windows"][wkey]
-                if wd.get("diff_rolling_OBA") is not None:
-                    player["diff_rolling_OBA"] = wd["diff_rolling_OBA"]
-                    break
-
-    if "diff_rolling_OBA" not in player:
+    for key, col in SEASON_STAT_COLS.items():
+        player[key] = safe_round(row.get(col), 3)
+
+    ev_row = ev_lookup.get(player_id)
+    if ev_row is not None:
+        for key, col in EV_STAT_COLS.items():
+            player[key] = safe_round(ev_row[col], 1)
+
+    windows = rolling_index["rolling"].get(player_id)
+    if windows is not None:
+        player["rolling"] = windows
+        player["total_pa_events"] = rolling_index["total_pa_events"][player_id]
+        if player_id in rolling_index["last_pa_date"]:
+            player["last_pa_date"] = rolling_index["last_pa_date"][player_id]
+
+    diff = rolling_index["diff_rolling_OBA"].get(player_id)
+    if diff is not None:
+        player["diff_rolling_OBA"] = diff
+    else:
         season_diff = row.get("est_woba_minus_woba_diff")
         if pd.notna(season_diff):
             player["diff_rolling_OBA"] = safe_round(-float(season_diff), 3)
@@ -334,6 +585,20 @@ def build_player(row, ev_df, rolling_data, team_map):
     return player
 
 
+def sort_by_rolling_diff(players):
+    """Stable ascending sort on diff_rolling_OBA (most underestimated first)."""
+    diffs = np.fromiter(
+        (p.get("diff_rolling_OBA") or 0.0 for p in players), dtype=np.float64, count=len(players)
+    )
+    return [players[i] for i in np.argsort(diffs, kind="stable")]
+
+
+def _rounded(values, decimals):
+    """Round a column, mapping missing or non-numeric values to None."""
+    values = pd.to_numeric(values, errors="coerce").round(decimals)
+    return values.astype(object).where(values.notna(), None)
+
+
 # ═══════════════════════════════════════════════════════════════════
 # OUTPUT BUILDERS
 # ═══════════════════════════════════════════════════════════════════
@@ -341,17 +606,57 @@ def build_player(row, ev_df, rolling_data, team_map):
 def build_output(expected_df, ev_df, rolling_data, team_map, year):
     """Single-season output."""
     print("[BUILD] Building output (single-season mode)...")
-    players = []
-    for _, row in expected_df.iterrows():
-        if int(row.get("pa", 0)) < MIN_PA:
-            continue
-        player = build_player(row, ev_df, rolling_data, team_map)
-        player["data_season"] = year
-        players.append(player)
+    expected_df = expected_df[expected_df["pa"].astype(int) >= MIN_PA]
+    expected_df = with_display_names(expected_df).reset_index(drop=True)
+    stats = expected_df.reindex(columns=list(SEASON_STAT_COLS.values()))
+
+    player_ids = expected_df["player_id"].astype(int)
+    out = pd.DataFrame({
+        "player_id": player_ids,
+        "name": expected_df["name"],
+        "team": player_ids.map(team_map).fillna(""),
+        "pa": expected_df["pa"].astype(int),
+    })
+    for key, col in SEASON_STAT_COLS.items():
+        out[key] = _rounded(stats[col], 3)
+
+    ev = out[["player_id"]].merge(ev_frame(ev_df), on="player_id", how="left", indicator=True)
+    has_ev = (ev["_merge"] == "both").to_numpy()
+    for key, col in EV_STAT_COLS.items():
+        out[key] = _rounded(ev[col], 1)
+
+    rolling_index = index_rolling_data(rolling_data)
+    has_rolling = out["player_id"].isin(rolling_index["rolling"].keys()).to_numpy()
+    for key in ["rolling", "total_pa_events", "last_pa_date"]:
+        out[key] = out["player_id"].map(rolling_index[key])
+    out["total_pa_events"] = out["total_pa_events"].astype("Int64")
+
+    # Rolling diff when available, otherwise the negated season-level diff
+    rolling_diff = out["player_id"].map(rolling_index["diff_rolling_OBA"])
+    season_diff = (-pd.to_numeric(stats["est_woba_minus_woba_diff"], errors="coerce")).round(3)
+    out["diff_rolling_OBA"] = rolling_diff.fillna(season_diff).fillna(0.0).astype(float)
+    out["data_season"] = year
+    out = out.sort_values("diff_rolling_OBA", kind="stable")
+    has_ev, has_rolling = has_ev[out.index], has_rolling[out.index]
+    out = out.reset_index(drop=True)
+
+    # Players without EV or rolling data omit those keys entirely, so emit
+    # records once per key set and put them back in sorted order.
+    players = [None] * len(out)
+    for with_ev in (True, False):
+        for with_rolling in (True, False):
+            mask = (has_ev == with_ev) & (has_rolling == with_rolling)
+            cols = ["player_id", "name", "team", "pa", *SEASON_STAT_COLS]
+            if with_ev:
+                cols += list(EV_STAT_COLS)
+            if with_rolling:
+                cols += ["rolling", "total_pa_events", "last_pa_date"]
+            cols += ["diff_rolling_OBA", "data_season"]
+            for pos, record in zip(np.flatnonzero(mask), out.loc[mask, cols].to_dict("records")):
+                players[pos] = record
 
-    players.sort(key=lambda p: p.get("diff_rolling_OBA", 0))
     return {
-        "generated_at": datetime.now().isoformat(),
+        "generated_at": datetime.now(),
         "mode": "current",
         "season": year,
         "total_players": len(players),
@@ -374,13 +679,17 @@ def build_transition_output(prev_expected, prev_ev, prev_year,
     # Lookup dicts for season-level stats
     curr_lookup = {}
     if curr_expected is not None and len(curr_expected) > 0:
-        for _, row in curr_expected.iterrows():
+        for row in with_display_names(curr_expected).to_dict("records"):
             curr_lookup[int(row["player_id"])] = row
 
     prev_lookup = {}
-    for _, row in prev_expected.iterrows():
+    for row in with_display_names(prev_expected).to_dict("records"):
         prev_lookup[int(row["player_id"])] = row
 
+    curr_ev_lookup = build_ev_lookup(curr_ev)
+    prev_ev_lookup = build_ev_lookup(prev_ev)
+    rolling_index = index_rolling_data(rolling_data)
+
     players = []
 
     # Include every batter that has rolling data (MIN_PA+ across seasons)
@@ -388,21 +697,21 @@ def build_transition_output(prev_expected, prev_ev, prev_year,
         # Pick season-level stats: prefer current season if they have MIN_PA there
         if pid in curr_lookup and int(curr_lookup[pid].get("pa", 0)) >= MIN_PA:
             row = curr_lookup[pid]
-            ev_df = curr_ev
+            ev_lookup = curr_ev_lookup
             data_season = curr_year
         elif pid in prev_lookup:
             row = prev_lookup[pid]
-            ev_df = prev_ev
+            ev_lookup = prev_ev_lookup
             data_season = prev_year
         elif pid in curr_lookup:
             # Has some current season data but not MIN_PA
             row = curr_lookup[pid]
-            ev_df = curr_ev
+            ev_lookup = curr_ev_lookup
             data_season = curr_year
         else:
             continue
 
-        player = build_player(row, ev_df, rolling_data, team_map)
+        player = build_player(row, ev_lookup, rolling_index, team_map)
         player["data_season"] = data_season
 
         if roll_info.get("cross_season"):
@@ -411,7 +720,7 @@ def build_transition_output(prev_expected, prev_ev, prev_year,
 
         players.append(player)
 
-    players.sort(key=lambda p: p.get("diff_rolling_OBA", 0))
+    players = sort_by_rolling_diff(players)
 
     n_curr = sum(1 for p in players if p.get("data_season") == curr_year)
 
@@ -420,7 +729,7 @@ def build_transition_output(prev_expected, prev_ev, prev_year,
     print(f"  -> {len(players)} total")
 
     return {
-        "generated_at": datetime.now().isoformat(),
+        "generated_at": datetime.now(),
         "mode": "transition",
         "season": curr_year,
         "fallback_season": prev_year,
@@ -434,12 +743,42 @@ def build_transition_output(prev_expected, prev_ev, prev_year,
 
 
 def safe_round(val, decimals=3):
-    if val is None or (isinstance(val, float) and np.isnan(val)):
+    if val is None:
         return None
     try:
-        return round(float(val), decimals)
+        f = float(val)
     except (TypeError, ValueError):
         return None
+    return None if f != f else round(f, decimals)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# OUTPUT WRITER
+# ═══════════════════════════════════════════════════════════════════
+
+def write_output(output, path):
+    """
+    Write ``output`` as 2-space-indented JSON, streaming the players list
+    one player at a time instead of serializing the whole document in
+    memory.  The bytes are identical to a single ``orjson.dumps`` call;
+    ``players`` must be the last key of ``output``.
+    """
+    option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+    header = {k: v for k, v in output.items() if k != "players"}
+    players = output["players"]
+
+    with open(path, "wb") as f:
+        # Reopen the header object: drop its closing "\n}"
+        f.write(orjson.dumps(header, option=option)[:-2])
+        if not players:
+            f.write(b',\n  "players": []\n}')
+            return
+        f.write(b',\n  "players": [')
+        for i, player in enumerate(players):
+            # Players sit two levels deep, so indent each line four spaces
+            f.write(b",\n    " if i else b"\n    ")
+            f.write(orjson.dumps(player, option=option).replace(b"\n", b"\n    "))
+        f.write(b"\n  ]\n}")
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -493,36 +832,35 @@ def main():
             print(f"  [WARN] No pitch data for {year}: {e}")
             curr_pitch = pd.DataFrame()
 
-        # ---- concatenate pitch data with season markers ----
-        print("\n  Concatenating pitch data across seasons...")
+        prev_pa = plate_appearances(prev_pitch)
+        curr_pa = plate_appearances(curr_pitch)
+
+        # ---- concatenate plate appearances with season markers ----
+        print("\n  Concatenating plate appearances across seasons...")
         frames = []
-        if len(prev_pitch) > 0:
-            p = prev_pitch.copy()
-            p["data_season"] = prev_year
-            frames.append(p)
-        if len(curr_pitch) > 0:
-            c = curr_pitch.copy()
-            c["data_season"] = year
-            frames.append(c)
+        if len(prev_pa) > 0:
+            frames.append(prev_pa.assign(data_season=prev_year))
+        if len(curr_pa) > 0:
+            frames.append(curr_pa.assign(data_season=year))
 
         if frames:
-            combined_pitch = pd.concat(frames, ignore_index=True)
-            print(f"  -> {len(combined_pitch)} total pitches across both seasons")
+            combined_pa = pd.concat(frames, ignore_index=True)
+            print(f"  -> {len(combined_pa)} total plate appearances across both seasons")
         else:
-            combined_pitch = pd.DataFrame()
+            combined_pa = pd.DataFrame()
 
         # ---- team mappings (prefer current season) ----
         team_map = {}
-        if len(prev_pitch) > 0:
-            team_map.update(extract_batter_teams(prev_pitch))
-        if len(curr_pitch) > 0:
-            team_map.update(extract_batter_teams(curr_pitch))
+        if len(prev_pa) > 0:
+            team_map.update(extract_batter_teams(prev_pa))
+        if len(curr_pa) > 0:
+            team_map.update(extract_batter_teams(curr_pa))
 
         # ---- cross-season rolling metrics ----
         rolling_data = {}
-        if len(combined_pitch) > 0:
+        if len(combined_pa) > 0:
             print("\n  Computing cross-season rolling metrics...")
-            rolling_data = compute_rolling_metrics(combined_pitch)
+            rolling_data = compute_rolling_metrics(combined_pa)
 
         # ---- build output ----
         output = build_transition_output(
@@ -544,17 +882,16 @@ def main():
         rolling_data = {}
         team_map = {}
         try:
-            pitch_df = fetch_pitch_level(year)
-            team_map = extract_batter_teams(pitch_df)
-            rolling_data = compute_rolling_metrics(pitch_df)
+            pa_df = plate_appearances(fetch_pitch_level(year))
+            team_map = extract_batter_teams(pa_df)
+            rolling_data = compute_rolling_metrics(pa_df)
         except Exception as e:
             print(f"  [WARN] No pitch data: {e}")
 
         output = build_output(expected_df, ev_df, rolling_data, team_map, year)
 
     # ---- save ----
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(output, f, indent=2, default=str)
+    write_output(output, OUTPUT_FILE)
 
     print(f"\n[DONE] Saved {output['total_players']} players to {OUTPUT_FILE}")
     print(f"       Mode: {output['mode']}")